@@ -1,51 +1,181 @@
-from typing import List, Dict, Any
-import math
-import csv
+from typing import List, Dict, Any, Optional, Tuple, Union
+from datetime import datetime
 from pathlib import Path
+import json
+import os
+import tempfile
 
+import numpy as np
+import pandas as pd
 
-def calculate_average_price(symbol: str, data: List[Dict[str, Any]], period: int) -> float:
-    """Return the average closing price for `symbol` using entries in `data`.
-    Returns 0.0 when no matching prices are found."""
-    prices: List[float] = []
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:  # numba is optional; kernels then run as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+    _HAS_NUMBA = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    _HAS_PYARROW = True
+except ImportError:  # pyarrow is optional; it enables the parquet cache in `load_data_from_csv`
+    _HAS_PYARROW = False
+
+# Indicator inputs: a frame from `load_data_from_csv` or a list of row dicts
+PriceData = Union[pd.DataFrame, List[Dict[str, Any]]]
+
+
+def _from_records(data: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build a symbol/date/close frame from a list of row dicts.
+    Rows without a symbol or with an invalid close value are skipped.
+    ISO date strings are parsed once here; other dates are treated as missing."""
+    symbols: List[Any] = []
+    dates: List[Any] = []
+    # Closes go straight into a preallocated float64 buffer instead of a list of float objects
+    closes = np.empty(len(data), dtype=np.float64)
+    n = 0
     for entry in data:
-        if entry.get("symbol") == symbol and "close" in entry:
+        if "symbol" not in entry or "close" not in entry:
+            continue
+        try:
+            close = float(entry["close"])
+        except (TypeError, ValueError):
+            # Skip rows with invalid close values
+            continue
+        date = entry.get("date")
+        if isinstance(date, str):
             try:
-                prices.append(float(entry["close"]))
-            except (TypeError, ValueError):
-                # Skip rows with invalid close values
-                continue
+                date = datetime.fromisoformat(date)
+            except ValueError:
+                # Ignore non-ISO dates; fall back to row order
+                date = None
+        elif not isinstance(date, datetime):
+            date = None
+        symbols.append(entry["symbol"])
+        dates.append(date)
+        closes[n] = close
+        n += 1
+
+    return pd.DataFrame({
+        "symbol": pd.Series(symbols, dtype=object),
+        "date": pd.Series(dates),
+        "close": closes[:n],
+    })
+
+
+def _price_frame(data: PriceData) -> pd.DataFrame:
+    """Return `data` as a symbol/date/close frame holding only rows with a valid close.
+
+    Rows are sorted once by symbol and date (stable, NaT last), so each symbol's closes
+    are contiguous and chronological whatever order `data` arrives in.
+    """
+    frame = data if isinstance(data, pd.DataFrame) else _from_records(data)
+    closes = pd.to_numeric(frame["close"], errors="coerce")
+    dates = frame["date"] if "date" in frame else pd.Series(None, index=frame.index, dtype=object)
+    valid = closes.notna() & frame["symbol"].notna()
+    frame = pd.DataFrame({
+        "symbol": frame["symbol"][valid],
+        "date": dates[valid],
+        "close": closes[valid].astype(np.float64),
+    })
+    try:
+        return frame.sort_values(["symbol", "date"], kind="stable", ignore_index=True)
+    except TypeError:
+        # Unorderable symbols or dates (e.g. mixed tz-aware and naive): keep the given order
+        return frame.reset_index(drop=True)
+
 
-    if not prices:
+def _group_by_symbol(frame: pd.DataFrame, positions: Dict[Any, np.ndarray]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Split a price frame into a dict mapping symbol -> (dates, closes) in input order.
+    `positions` is `frame.groupby("symbol").indices`, possibly restricted to some symbols.
+
+    All closes are gathered once into one contiguous float64 buffer and each symbol gets
+    a view of its slice, so the indicator kernels share memory instead of per-symbol copies.
+    """
+    if not positions:
+        return {}
+    order = np.concatenate(list(positions.values()))
+    dates = frame["date"].to_numpy()[order]
+    closes = frame["close"].to_numpy(dtype=np.float64)[order]
+
+    index: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    start = 0
+    for symbol, pos in positions.items():
+        end = start + len(pos)
+        index[symbol] = (dates[start:end], closes[start:end])
+        start = end
+    return index
+
+
+# Symbol index for the most recently indexed data object, keyed by id(data).
+# Only one entry is kept so nothing accumulates; it holds a reference to its data
+# object so the id cannot be reused by another object while cached.
+_INDEX_CACHE: Dict[int, Tuple[Any, Dict[str, Tuple[np.ndarray, np.ndarray]]]] = {}
+
+
+def clear_cache() -> None:
+    """Drop the cached symbol index. Call after mutating data that was already indexed."""
+    _INDEX_CACHE.clear()
+
+
+def _symbol_index(data: PriceData) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Return the (cached) symbol index for `data`, building it on first use."""
+    cached = _INDEX_CACHE.get(id(data))
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    frame = _price_frame(data)
+    index = _group_by_symbol(frame, frame.groupby("symbol", sort=False).indices)
+    _INDEX_CACHE.clear()
+    _INDEX_CACHE[id(data)] = (data, index)
+    return index
+
+
+def _series_for(symbol: str, data: PriceData) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (dates, closes) for `symbol`, or empty arrays when it has no rows."""
+    series = _symbol_index(data).get(symbol)
+    if series is None:
+        return np.empty(0, dtype=object), np.empty(0, dtype=np.float64)
+    return series
+
+
+def calculate_average_price(symbol: str, data: PriceData, period: int = 20,
+                            prices: Optional[np.ndarray] = None) -> float:
+    """Return the average closing price for `symbol` using entries in `data`.
+    Pass `prices` to reuse closes already extracted for `symbol`.
+    Returns 0.0 when no matching prices are found."""
+    if prices is None:
+        _, prices = _series_for(symbol, data)
+
+    if len(prices) == 0:
         return 0.0
     
-    recent_prices = prices[-period:]
+    recent_prices = np.asarray(prices[-period:], dtype=np.float64)
 
-    return sum(recent_prices) / period
+    return float(recent_prices.mean())
 
-def calculate_bollinger_bands(symbol: str, data: List[Dict[str, Any]], period: int) -> Dict[str, float]:
+def calculate_bollinger_bands(symbol: str, data: PriceData, period: int = 20,
+                              prices: Optional[np.ndarray] = None) -> Dict[str, float]:
     """Calculate Bollinger Bands (population std dev) for `symbol` over provided `data`.
 
     Returns a dict with keys: `average`, `std_dev`, `upper`, `lower`.
     Uses population standard deviation (divides by n) and band width = 2 * std_dev.
+    Pass `prices` to reuse closes already extracted for `symbol`.
     If no data is found for `symbol`, all values are 0.0.
     """
-    prices: List[float] = []
-    for entry in data:
-        if entry.get("symbol") == symbol and "close" in entry:
-            try:
-                prices.append(float(entry["close"]))
-            except (TypeError, ValueError):
-                continue
+    if prices is None:
+        _, prices = _series_for(symbol, data)
 
-    if not prices:
+    if len(prices) == 0:
         return {"average": 0.0, "std_dev": 0.0, "upper": 0.0, "lower": 0.0}
 
-    recent_prices = prices[-period:]
+    recent_prices = np.asarray(prices[-period:], dtype=np.float64)
 
-    avg = sum(recent_prices) / period
-    variance = sum((p - avg) ** 2 for p in recent_prices) / period  # population variance
-    std_dev = math.sqrt(variance)
+    avg = float(recent_prices.mean())
+    std_dev = float(recent_prices.std())  # population std dev (ddof=0)
     band_width = 2 * std_dev
     upper = avg + band_width
     lower = avg - band_width
@@ -53,38 +183,100 @@ def calculate_bollinger_bands(symbol: str, data: List[Dict[str, Any]], period: i
     return {"average": avg, "std_dev": std_dev, "upper": upper, "lower": lower}
 
 
-def get_latest_close(symbol: str, data: List[Dict[str, Any]]) -> float:
-    """Return the latest closing price for `symbol`. Uses the 'date' field when available; otherwise uses the last occurrence."""
-    from datetime import datetime
+def bollinger_series(close: pd.Series, period: int = 20) -> pd.DataFrame:
+    """Calculate Bollinger Bands for every point of a chronological `close` series.
 
-    dated_entries = []
-    last_price = None
-    for entry in data:
-        if entry.get("symbol") == symbol and "close" in entry:
-            try:
-                close = float(entry["close"])
-            except (TypeError, ValueError):
+    Returns a DataFrame indexed like `close` with columns `average`, `std_dev`, `upper`
+    and `lower` (population std dev, band width = 2 * std_dev). Rows before the first
+    full window are NaN. Uses pandas' O(n) rolling kernels.
+    """
+    window = close.astype(np.float64).rolling(period)
+    avg = window.mean()
+    std_dev = window.std(ddof=0)
+    band_width = 2 * std_dev
+    return pd.DataFrame({
+        "average": avg,
+        "std_dev": std_dev,
+        "upper": avg + band_width,
+        "lower": avg - band_width,
+    })
+
+
+def streaming_bbands(prices: np.ndarray, period: int = 20) -> Dict[str, float]:
+    """Calculate the latest Bollinger Bands for `prices` in a single streaming pass.
+
+    Keeps a running mean and sum of squared deviations over the last `period` closes
+    (sliding-window Welford update), so each new close costs O(1) instead of O(period).
+    Returns the same keys as `calculate_bollinger_bands`; all 0.0 when `prices` is empty.
+    """
+    avg, std_dev = _bbands_stream(np.asarray(prices, dtype=np.float64), period)
+    avg, std_dev = float(avg), float(std_dev)
+    band_width = 2 * std_dev
+    return {"average": avg, "std_dev": std_dev, "upper": avg + band_width, "lower": avg - band_width}
+
+
+@njit(cache=True, nogil=True)
+def _bbands_stream(prices: np.ndarray, period: int) -> Tuple[float, float]:
+    """Return (mean, population std dev) of the last `period` prices; see `streaming_bbands`."""
+    n = prices.shape[0]
+    if n == 0:
+        return 0.0, 0.0
+
+    count = 0
+    mean = 0.0
+    m2 = 0.0  # sum of squared deviations from the mean
+    for i in range(n):
+        price = prices[i]
+        if count < period:
+            count += 1
+            delta = price - mean
+            mean += delta / count
+            m2 += delta * (price - mean)
+        else:
+            # Slide the window: add `price`, drop the close that fell out of it
+            dropped = prices[i - period]
+            new_mean = mean + (price - dropped) / period
+            m2 += (price - dropped) * (price - new_mean + dropped - mean)
+            mean = new_mean
+
+    variance = m2 / count  # population variance
+    if variance < 0.0:
+        variance = 0.0
+    return mean, np.sqrt(variance)
+
+
+def get_latest_close(symbol: str, data: PriceData,
+                     prices: Optional[np.ndarray] = None, dates: Optional[np.ndarray] = None) -> float:
+    """Return the latest closing price for `symbol`. Uses the 'date' field when available; otherwise uses the last occurrence.
+    Pass `prices` (and optionally the matching `dates`) to reuse values already extracted for `symbol`."""
+    if prices is None:
+        dates, prices = _series_for(symbol, data)
+    return _latest_close(dates, prices)
+
+
+def _latest_close(dates: Optional[np.ndarray], closes: np.ndarray) -> float:
+    """Return the close with the max date, falling back to the last close (0.0 when empty).
+    `dates` are already parsed; missing dates (None/NaT) are ignored."""
+    # Track the entry with the max date in a single pass
+    best_dt = None
+    best_close = 0.0
+    if dates is not None:
+        for dt, close in zip(dates, closes):
+            if dt is None or dt != dt:  # NaT != NaT
                 continue
-            date_str = entry.get("date")
-            if date_str:
-                try:
-                    dt = datetime.fromisoformat(date_str)
-                    dated_entries.append((dt, close))
-                except ValueError:
-                    # Ignore non-ISO dates for parsing; fallback to last_price
-                    pass
-            last_price = close
-
-    if dated_entries:
-        # pick entry with the max date
-        return max(dated_entries, key=lambda x: x[0])[1]
-
-    if last_price is not None:
-        return last_price
+            if best_dt is None or dt > best_dt:
+                best_dt, best_close = dt, close
+
+    if best_dt is not None:
+        return float(best_close)
+
+    if len(closes):
+        return float(closes[-1])
 
     return 0.0
 
-def calculate_rsi(symbol: str, data: List[Dict[str, Any]], period: int) -> float:
+def calculate_rsi(symbol: str, data: PriceData, period: int = 14,
+                  prices: Optional[np.ndarray] = None) -> float:
     """Calculate the Relative Strength Index (RSI) for `symbol` using Wilder's smoothing.
 
     RSI = 100 - 100 / (1 + RS), where
@@ -93,6 +285,11 @@ def calculate_rsi(symbol: str, data: List[Dict[str, Any]], period: int) -> float
     Wilder's smoothing is a recursive average:
       avg_gain_t = (avg_gain_{t-1} * (period - 1) + gain_t) / period
       avg_loss_t = (avg_loss_{t-1} * (period - 1) + loss_t) / period
+    i.e. an EMA with alpha = 1 / period: avg_t = avg_{t-1} + (x_t - avg_{t-1}) * alpha
+
+    Rows are put in date order once, when the (cached) symbol index for `data` is
+    built, so no per-call sort is done here.
+    Pass `prices` (in chronological order) to reuse closes already extracted for `symbol`.
 
     Returns 0.0 if insufficient data or no data for symbol.
     Preserves prior behavior for edge cases:
@@ -100,54 +297,42 @@ def calculate_rsi(symbol: str, data: List[Dict[str, Any]], period: int) -> float
       - If avg_loss == 0 and avg_gain == 0 => 0.0
     """
 
-    # Collect rows for the symbol and (optionally) sort if a 'date' field is present.
-    rows = [entry for entry in data if entry.get("symbol") == symbol and "close" in entry]
-    if not rows:
-        return 0.0
+    if prices is None:
+        _, prices = _series_for(symbol, data)
 
-    # If a sortable 'date' key exists, sort by it to be safe; otherwise assume input is chronological.
-    try:
-        rows.sort(key=lambda x: x.get("date"))
-    except Exception:
-        pass
+    return _rsi(np.asarray(prices, dtype=np.float64), period)
 
-    # Extract/clean closes
-    prices: List[float] = []
-    for entry in rows:
-        try:
-            prices.append(float(entry["close"]))
-        except (TypeError, ValueError):
-            continue
 
+@njit(cache=True, nogil=True, fastmath=True)
+def _rsi_wilder(prices: np.ndarray, period: int) -> float:
+    """Wilder RSI over chronologically ordered float64 `prices`; see `calculate_rsi`."""
+    n = prices.shape[0]
     # Need at least period + 1 prices to compute initial period changes
-    if len(prices) < period + 1:
+    if n < period + 1:
         return 0.0
 
     # --- 1) Initial averages from the first `period` changes
-    recent_prices = prices[-(period + 1):]
-    gains: List[float] = []
-    losses: List[float] = []
-    for i in range(1, period + 1):        
-        change = recent_prices[i] - recent_prices[i - 1]
+    gain_sum = 0.0
+    loss_sum = 0.0
+    for i in range(1, period + 1):
+        change = prices[i] - prices[i - 1]
         if change > 0:
-            gains.append(change)
-            losses.append(0.0)
+            gain_sum += change
         else:
-            gains.append(0.0)
-            losses.append(-change)  # positive loss magnitude
-            
-    avg_gain = sum(gains) / period
-    avg_loss = sum(losses) / period
-
-    # --- 2) Wilder smoothing over the rest of the series
-    for i in range(period + 1, len(prices)):
+            loss_sum -= change  # positive loss magnitude
+    avg_gain = gain_sum / period
+    avg_loss = loss_sum / period
+
+    # --- 2) Wilder smoothing over the rest of the series, as an EMA with alpha = 1/period
+    alpha = 1.0 / period
+    for i in range(period + 1, n):
         change = prices[i] - prices[i - 1]
         gain = change if change > 0 else 0.0
         loss = -change if change < 0 else 0.0
 
-        avg_gain = (avg_gain * (period - 1) + gain) / period
-        avg_loss = (avg_loss * (period - 1) + loss) / period
-        
+        avg_gain += (gain - avg_gain) * alpha
+        avg_loss += (loss - avg_loss) * alpha
+
     # --- 3) Final RSI for the latest point
     if avg_loss == 0.0:
         # Preserve your previous convention:
@@ -156,46 +341,305 @@ def calculate_rsi(symbol: str, data: List[Dict[str, Any]], period: int) -> float
         return 100.0 if avg_gain > 0 else 0.0
 
     rs = avg_gain / avg_loss
-    rsi = 100.0 - (100.0 / (1.0 + rs))
-    return rsi
+    return 100.0 - (100.0 / (1.0 + rs))
+
+
+def calculate_bands_and_rsi(symbol: str, data: PriceData, bollinger_bands_period: int = 20, rsi_period: int = 14,
+                            prices: Optional[np.ndarray] = None) -> Dict[str, float]:
+    """Calculate Bollinger Bands and RSI for `symbol` in one fused pass over its closes.
+
+    Returns the keys of `calculate_bollinger_bands` plus `rsi`, with the same values as
+    calling `calculate_bollinger_bands` and `calculate_rsi` separately.
+    Pass `prices` (in chronological order) to reuse closes already extracted for `symbol`.
+    If no data is found for `symbol`, all values are 0.0.
+    """
+    if prices is None:
+        _, prices = _series_for(symbol, data)
 
-def load_data_from_csv(file_path: str) -> List[Dict[str, Any]]:
+    average, std_dev, rsi = _indicator_pack(np.asarray(prices, dtype=np.float64), bollinger_bands_period, rsi_period)
+    average, std_dev = float(average), float(std_dev)
+    band_width = 2 * std_dev
+    return {
+        "average": average,
+        "std_dev": std_dev,
+        "upper": average + band_width,
+        "lower": average - band_width,
+        "rsi": float(rsi),
+    }
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _indicator_pack(prices: np.ndarray, bb_period: int, rsi_period: int) -> Tuple[float, float, float]:
+    """Return (average, std_dev, rsi) from one pass over chronological `prices`.
+
+    Fuses the Bollinger window sums and the Wilder RSI recurrence so each close is loaded
+    once; results match `calculate_bollinger_bands` and `_rsi_wilder`.
+    """
+    n = prices.shape[0]
+    if n == 0:
+        return 0.0, 0.0, 0.0
+
+    # Window sums are taken relative to the first close in the window to limit cancellation
+    bb_start = max(0, n - bb_period)
+    shift = prices[bb_start]
+    s1 = 0.0
+    s2 = 0.0
+
+    gain_sum = 0.0
+    loss_sum = 0.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    alpha = 1.0 / rsi_period
+
+    for i in range(n):
+        price = prices[i]
+        if i >= bb_start:
+            d = price - shift
+            s1 += d
+            s2 += d * d
+        if i == 0:
+            continue
+
+        change = price - prices[i - 1]
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        if i <= rsi_period:
+            # Seed from the first `rsi_period` changes
+            gain_sum += gain
+            loss_sum += loss
+            if i == rsi_period:
+                avg_gain = gain_sum / rsi_period
+                avg_loss = loss_sum / rsi_period
+        else:
+            avg_gain += (gain - avg_gain) * alpha
+            avg_loss += (loss - avg_loss) * alpha
+
+    count = n - bb_start
+    mean_d = s1 / count
+    variance = s2 / count - mean_d * mean_d  # population variance
+    if variance < 0.0:
+        variance = 0.0
+
+    if n < rsi_period + 1:
+        rsi = 0.0
+    elif avg_loss == 0.0:
+        rsi = 100.0 if avg_gain > 0 else 0.0
+    else:
+        rsi = 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+
+    return shift + mean_d, np.sqrt(variance), rsi
+
+
+def _rsi_numpy(prices: np.ndarray, period: int) -> float:
+    """NumPy RSI used when numba is unavailable; same result as `_rsi_wilder`.
+    Gains and losses are split branch-free with np.maximum; only the recursive
+    smoothing runs as a Python loop."""
+    if prices.shape[0] < period + 1:
+        return 0.0
+
+    diff = np.diff(prices)
+    gains = np.maximum(diff, 0.0)
+    losses = np.maximum(-diff, 0.0)
+    avg_gain = float(gains[:period].mean())
+    avg_loss = float(losses[:period].mean())
+
+    alpha = 1.0 / period
+    for gain, loss in zip(gains[period:].tolist(), losses[period:].tolist()):
+        avg_gain += (gain - avg_gain) * alpha
+        avg_loss += (loss - avg_loss) * alpha
+
+    if avg_loss == 0.0:
+        return 100.0 if avg_gain > 0 else 0.0
+
+    rs = avg_gain / avg_loss
+    return 100.0 - (100.0 / (1.0 + rs))
+
+
+def _rsi(prices: np.ndarray, period: int) -> float:
+    """Dispatch to the compiled RSI kernel, or the NumPy one when numba is unavailable."""
+    if not _HAS_NUMBA:
+        return _rsi_numpy(prices, period)
+    return _rsi_wilder(prices, period)
+
+
+# Compile (or load the cached builds of) the kernels at import, not on first scan
+_rsi_wilder(np.zeros(2, dtype=np.float64), 1)
+_indicator_pack(np.zeros(2, dtype=np.float64), 1, 1)
+
+
+_CSV_COLUMNS = frozenset({"symbol", "date", "close"})
+
+
+def load_data_from_csv(file_path: str, use_cache: bool = True) -> pd.DataFrame:
+    """Load price rows into a DataFrame with `symbol`, datetime64 `date` and float64 `close` columns.
+    Dates are parsed once here. Invalid dates become NaT and invalid close values become NaN;
+    the indicators skip both.
+
+    When pyarrow is installed and `use_cache` is set, the parsed frame is cached in a
+    `.parquet` file next to the CSV. The cache is reused only while its recorded format
+    version and the CSV's mtime and size all match.
+    """
     p = Path(file_path)
-    data: List[Dict[str, Any]] = []
-    with p.open(mode='r', newline='') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            data.append(row)
-    return data
+    cache = p.with_suffix(".parquet")
+    use_cache = use_cache and _HAS_PYARROW
+    if use_cache:
+        key = _cache_key(p)
+        cached = _read_cache(cache, key)
+        if cached is not None:
+            return cached
+
+    # Only the columns the indicators use are parsed; any others in the file are skipped.
+    # NA parsing is off so tickers such as "NA" or "NULL" stay strings; invalid
+    # close/date values are coerced to NaN/NaT below.
+    df = pd.read_csv(
+        p,
+        usecols=lambda column: column in _CSV_COLUMNS,
+        dtype={"symbol": str, "date": str},
+        keep_default_na=False,
+    )
+    if "date" in df:
+        # ISO8601 accepts mixed precision (dates and datetimes) instead of inferring
+        # one format from the first row and coercing the rest to NaT
+        try:
+            df["date"] = pd.to_datetime(df["date"], format="ISO8601", errors="coerce")
+        except ValueError:
+            # Mixed UTC offsets (e.g. across a DST change) have no common zone; compare them in UTC
+            df["date"] = pd.to_datetime(df["date"], format="ISO8601", errors="coerce", utc=True)
+    df["close"] = pd.to_numeric(df["close"], errors="coerce")
+
+    if use_cache:
+        _write_cache(df, cache, key)
+    return df
+
+
+# Bump whenever load_data_from_csv changes what it stores, so older caches are rebuilt
+_CACHE_VERSION = 1
+_CACHE_METADATA_KEY = b"stock_scanner.cache"
+
+
+def _cache_key(csv_path: Path) -> bytes:
+    """Identify the loader version and the exact CSV a cache was built from."""
+    stat = csv_path.stat()
+    return json.dumps(
+        {"version": _CACHE_VERSION, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size},
+        sort_keys=True,
+    ).encode()
+
 
+def _read_cache(cache: Path, key: bytes) -> Optional[pd.DataFrame]:
+    """Return the cached frame if `cache` exists and was written for `key`; otherwise None."""
+    if not cache.exists():
+        return None
+    try:
+        metadata = pq.read_schema(cache).metadata or {}
+        if metadata.get(_CACHE_METADATA_KEY) != key:
+            return None
+        return pq.read_table(cache).to_pandas()
+    except (OSError, ValueError, TypeError):
+        # Unreadable cache: fall back to parsing the CSV, which rewrites it
+        return None
+
+
+def _write_cache(df: pd.DataFrame, cache: Path, key: bytes) -> None:
+    """Atomically write `df` to `cache` tagged with `key`; failures only cost the cache, not the load."""
+    # A unique temp name, so concurrent loads never write into each other's file
+    try:
+        fd, name = tempfile.mkstemp(prefix=cache.name + ".", suffix=".tmp", dir=cache.parent)
+    except OSError:
+        return
+    os.close(fd)
+    tmp = Path(name)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _CACHE_METADATA_KEY: key})
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, cache)
+    except (OSError, ValueError, TypeError):
+        tmp.unlink(missing_ok=True)
 
-def scan_for_opportunities(data: List[Dict[str, Any]], bollinger_bands_period: int, rsi_period: int) -> List[Dict[str, Any]]:
+
+def scan_for_opportunities(data: PriceData, bollinger_bands_period: int = 20, rsi_period: int = 14) -> List[Dict[str, Any]]:
     """Scan all stocks in data and find those where:
     - Latest closing price is below the lower Bollinger Band
     - RSI (14-day) is below 30
+
+    Bands and RSI are computed from the last rows of each symbol after one sort by
+    symbol and date; the latest close is the one `get_latest_close` returns.
     
     Returns a list of dicts with keys: symbol, latest_close, lower_band, rsi
     """
-    # Get all unique symbols
-    symbols = set()
-    for entry in data:
-        if "symbol" in entry:
-            symbols.add(entry["symbol"])
-    
+    frame = _price_frame(data)
+    groups = frame.groupby("symbol", sort=False)
+    latest = _latest_closes(frame, groups)
+    if _HAS_NUMBA:
+        opportunities = _scan_fused(frame, groups, latest, bollinger_bands_period, rsi_period)
+    else:
+        opportunities = _scan_vectorized(frame, groups, latest, bollinger_bands_period, rsi_period)
+
+    # Only the (small) result set is sorted by symbol, not the whole universe
+    opportunities.sort(key=lambda o: o["symbol"])
+    return opportunities
+
+
+def _latest_closes(frame: pd.DataFrame, groups: Any) -> pd.Series:
+    """Return each symbol's latest close, as `_latest_close` picks it, from a sorted `_price_frame`.
+
+    That is the first row of the symbol's max date (the last dated run, since NaT sorts
+    last); symbols without any dated rows fall back to their last row.
+    """
+    dates, symbols = frame["date"], frame["symbol"]
+    run_start = dates.notna() & ((dates != dates.shift()) | (symbols != symbols.shift()))
+    latest = groups["close"].last()
+    latest.update(frame["close"][run_start].groupby(symbols[run_start], sort=False).last())
+    return latest
+
+
+def _scan_fused(frame: pd.DataFrame, groups: Any, latest: pd.Series,
+                bollinger_bands_period: int, rsi_period: int) -> List[Dict[str, Any]]:
+    """Scan with one compiled `_indicator_pack` pass per symbol."""
+    latest_closes = latest.to_dict()
     opportunities = []
-    
-    for symbol in sorted(symbols):
-        latest_close = get_latest_close(symbol, data)
-        bands = calculate_bollinger_bands(symbol, data, bollinger_bands_period)  # Use 20-day period for bands
-        rsi = calculate_rsi(symbol, data, rsi_period)
-        
+    for symbol, (_, closes) in _group_by_symbol(frame, groups.indices).items():
+        average, std_dev, rsi = _indicator_pack(closes, bollinger_bands_period, rsi_period)
+        latest_close = latest_closes[symbol]
+        lower_band = average - 2 * std_dev
+
         # Check both conditions
-        if latest_close > 0 and latest_close < bands["lower"] and rsi < 30:
+        if latest_close > 0 and latest_close < lower_band and rsi < 30:
             opportunities.append({
                 "symbol": symbol,
                 "latest_close": latest_close,
-                "lower_band": bands["lower"],
+                "lower_band": lower_band,
                 "rsi": rsi,
             })
-    
     return opportunities
+
+
+def _scan_vectorized(frame: pd.DataFrame, groups: Any, latest: pd.Series,
+                     bollinger_bands_period: int, rsi_period: int) -> List[Dict[str, Any]]:
+    """Scan with vectorized pandas reductions; used when numba is unavailable."""
+    window = groups["close"].tail(bollinger_bands_period).groupby(frame["symbol"], sort=False)
+
+    stats = pd.DataFrame({
+        "latest_close": latest,
+        "average": window.mean(),
+        "std_dev": window.std(ddof=0),  # population std dev
+    })
+    stats["lower_band"] = stats["average"] - 2 * stats["std_dev"]
+
+    # Cheap price/band check first; the recursive RSI only runs for symbols that pass it
+    candidates = stats[(stats["latest_close"] > 0) & (stats["latest_close"] < stats["lower_band"])]
+    if candidates.empty:
+        return []
+
+    # Wilder smoothing is recursive, so RSI still runs per symbol; reuse the scan's grouping
+    positions = groups.indices
+    index = _group_by_symbol(frame, {symbol: positions[symbol] for symbol in candidates.index})
+    rsi = pd.Series(
+        [_rsi(index[symbol][1], rsi_period) for symbol in candidates.index],
+        index=candidates.index,
+    )
+
+    opportunities = candidates.loc[rsi < 30, ["latest_close", "lower_band"]]
+    opportunities["rsi"] = rsi[rsi < 30]
+    return opportunities.rename_axis("symbol").reset_index().to_dict(orient="records")
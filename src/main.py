@@ -7,10 +7,12 @@ from typing import List, Dict, Any
 from .indicators import (
     calculate_average_price,
     calculate_bollinger_bands,
+    calculate_bands_and_rsi,
     load_data_from_csv,
     get_latest_close,
     calculate_rsi,
     scan_for_opportunities,
+    clear_cache,
 )
 
 def load_config(config_file: str = "config/settings.json") -> dict:
@@ -38,6 +40,9 @@ def main(argv: List[str] | None = None) -> int:
     parser.add_argument("--scan", action="store_true", help="Scan all stocks for oversold opportunities (latest close < lower band AND RSI < 30)")
     args = parser.parse_args(argv)
 
+    # Indicators share per-symbol closes within a run; start each run fresh
+    clear_cache()
+
     # Load configuration
     config = load_config("config/settings.json")
     AVERAGE_PRICE_PERIOD = config.get("average_price_period_in_days")
@@ -81,13 +86,21 @@ def main(argv: List[str] | None = None) -> int:
     print(f"Close: ${latest:.2f}")
     print(f"Average: ${avg:.2f}")
 
-    if args.bands:
+    bands = rsi = None
+    if args.bands and args.rsi:
+        # One fused pass over the closes for both indicators
+        bands = calculate_bands_and_rsi(args.symbol, data, BOLLINGER_BANDS_PERIOD, RSI_PERIOD)
+        rsi = bands["rsi"]
+    elif args.bands:
         bands = calculate_bollinger_bands(args.symbol, data, BOLLINGER_BANDS_PERIOD)
+    elif args.rsi:
+        rsi = calculate_rsi(args.symbol, data, RSI_PERIOD)
+
+    if bands is not None:
         print(f"Lower Band: ${bands['lower']:.2f}")
         print(f"Upper Band: ${bands['upper']:.2f}")
 
-    if args.rsi:
-        rsi = calculate_rsi(args.symbol, data, RSI_PERIOD)
+    if rsi is not None:
         print(f"RSI (14): {rsi:.2f}")
 
     return 0
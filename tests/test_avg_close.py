@@ -1,6 +1,13 @@
 # ...existing code...
 import pytest
-from src.indicators import calculate_average_price, calculate_bollinger_bands, get_latest_close
+import pandas as pd
+from src.indicators import (
+    bollinger_series,
+    calculate_average_price,
+    calculate_bollinger_bands,
+    get_latest_close,
+    streaming_bbands,
+)
 
 @pytest.fixture
 def data():
@@ -40,6 +47,12 @@ def test_different_symbol(data):
     assert average == 0.0
 
 
+def test_average_price_short_history():
+    # fewer rows than the period: average only the rows available
+    data = [{"symbol": "AAPL", "close": 150.0}, {"symbol": "AAPL", "close": 154.0}]
+    assert calculate_average_price("AAPL", data, 20) == pytest.approx(152.0)
+
+
 def test_bollinger_bands(data):
     bands = calculate_bollinger_bands("AAPL", data)
     assert bands["average"] == pytest.approx(159.5)
@@ -53,6 +66,27 @@ def test_bollinger_no_data():
     bands = calculate_bollinger_bands("AAPL", [])
     assert bands == {"average": 0.0, "std_dev": 0.0, "upper": 0.0, "lower": 0.0}
 
+def test_bollinger_series(data):
+    close = pd.Series([100.0, 90.0, 80.0] + [entry["close"] for entry in data])
+    series = bollinger_series(close, 20)
+    assert list(series.columns) == ["average", "std_dev", "upper", "lower"]
+    assert series.iloc[:19].isna().all().all()
+    expected = calculate_bollinger_bands("AAPL", data, 20)
+    for key in ("average", "std_dev", "upper", "lower"):
+        assert series[key].iloc[-1] == pytest.approx(expected[key])
+
+
+def test_streaming_bbands_matches_window(data):
+    prices = [100.0, 90.0, 80.0] + [entry["close"] for entry in data]
+    bands = streaming_bbands(prices, 20)
+    expected = calculate_bollinger_bands("AAPL", data, 20)
+    for key in ("average", "std_dev", "upper", "lower"):
+        assert bands[key] == pytest.approx(expected[key])
+
+
+def test_streaming_bbands_no_data():
+    assert streaming_bbands([], 20) == {"average": 0.0, "std_dev": 0.0, "upper": 0.0, "lower": 0.0}
+
 if __name__ == '__main__':
     import pytest
     pytest.main([__file__])
\ No newline at end of file
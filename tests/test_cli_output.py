@@ -1,6 +1,15 @@
+import pytest
+from src import indicators
 from src.main import main
 
 
+@pytest.fixture(autouse=True)
+def no_parquet_cache(monkeypatch):
+    # main() loads data/prices.csv; keep the parquet cache out of the source tree
+    monkeypatch.setattr(indicators, "_HAS_PYARROW", False)
+
+
+
 def test_cli_bands_output(capsys):
     # call CLI with bands to include lower and upper bands
     rc = main(["AAPL", "--bands"])
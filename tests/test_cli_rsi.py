@@ -1,6 +1,15 @@
+import pytest
+from src import indicators
 from src.main import main
 
 
+@pytest.fixture(autouse=True)
+def no_parquet_cache(monkeypatch):
+    # main() loads data/prices.csv; keep the parquet cache out of the source tree
+    monkeypatch.setattr(indicators, "_HAS_PYARROW", False)
+
+
+
 def test_cli_rsi_output(capsys):
     """Test CLI with RSI flag displays RSI value."""
     rc = main(["AAPL", "--rsi"])
@@ -1,5 +1,6 @@
 import pytest
-from src.indicators import get_latest_close
+from src import indicators
+from src.indicators import clear_cache, get_latest_close
 
 
 def test_latest_close_with_fixture():
@@ -37,5 +38,31 @@ def test_latest_with_no_date():
     assert get_latest_close("AAPL", data_no_date) == pytest.approx(155.0)
 
 
+def test_latest_uses_max_date():
+    data = [
+        {"symbol": "AAPL", "date": "2025-01-02", "close": 155.0},
+        {"symbol": "AAPL", "date": "2025-01-01", "close": 150.0},
+        {"symbol": "AAPL", "date": "not a date", "close": 140.0},
+    ]
+    assert get_latest_close("AAPL", data) == pytest.approx(155.0)
+
+
 def test_latest_no_data():
     assert get_latest_close("AAPL", []) == 0.0
+
+
+def test_latest_after_clear_cache():
+    data = [{"symbol": "AAPL", "close": 150.0}]
+    assert get_latest_close("AAPL", data) == pytest.approx(150.0)
+    data.append({"symbol": "AAPL", "close": 155.0})
+    clear_cache()
+    assert get_latest_close("AAPL", data) == pytest.approx(155.0)
+
+
+def test_cache_keeps_only_latest_data():
+    first = [{"symbol": "AAPL", "close": 150.0}]
+    second = [{"symbol": "AAPL", "close": 155.0}]
+    assert get_latest_close("AAPL", first) == pytest.approx(150.0)
+    assert get_latest_close("AAPL", second) == pytest.approx(155.0)
+    assert len(indicators._INDEX_CACHE) == 1
+    assert get_latest_close("AAPL", first) == pytest.approx(150.0)
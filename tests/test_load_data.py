@@ -0,0 +1,152 @@
+import os
+
+import pandas as pd
+import pytest
+from src import indicators
+from src.indicators import calculate_average_price, get_latest_close, load_data_from_csv
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_text(
+        "symbol,date,close\n"
+        "AAPL,2025-01-01,150.0\n"
+        "MSFT,2025-01-01,400.0\n"
+        "AAPL,2025-01-02,n/a\n"
+        "AAPL,2025-01-03,154.0\n"
+    )
+    return path
+
+
+def test_load_columns(csv_file):
+    df = load_data_from_csv(str(csv_file))
+    assert list(df.columns) == ["symbol", "date", "close"]
+    assert df["close"].dtype == "float64"
+    assert pd.api.types.is_datetime64_any_dtype(df["date"])
+    assert len(df) == 4
+
+
+def test_indicators_skip_invalid_close(csv_file):
+    df = load_data_from_csv(str(csv_file))
+    assert get_latest_close("AAPL", df) == pytest.approx(154.0)
+    assert calculate_average_price("AAPL", df, 20) == pytest.approx(152.0)
+
+
+def test_parquet_cache_reused(csv_file, tmp_path):
+    pytest.importorskip("pyarrow")
+    first = load_data_from_csv(str(csv_file))
+    cache = csv_file.with_suffix(".parquet")
+    assert cache.exists()
+    assert not list(tmp_path.glob("*.tmp"))
+    pd.testing.assert_frame_equal(load_data_from_csv(str(csv_file)), first, check_dtype=False)
+
+
+def test_parquet_cache_refreshed_when_csv_changes(csv_file):
+    pytest.importorskip("pyarrow")
+    load_data_from_csv(str(csv_file))
+    cache = csv_file.with_suffix(".parquet")
+    csv_file.write_text("symbol,date,close\nAAPL,2025-01-01,99.0\n")
+    mtime = cache.stat().st_mtime
+    os.utime(csv_file, (mtime + 10, mtime + 10))
+    df = load_data_from_csv(str(csv_file))
+    assert df["close"].tolist() == [99.0]
+
+
+def test_parquet_cache_refreshed_when_csv_replaced_by_older_copy(csv_file):
+    pytest.importorskip("pyarrow")
+    load_data_from_csv(str(csv_file))
+    cache = csv_file.with_suffix(".parquet")
+    csv_file.write_text("symbol,date,close\nAAPL,2025-01-01,99.0\n")
+    mtime = cache.stat().st_mtime
+    os.utime(csv_file, (mtime - 3600, mtime - 3600))
+    df = load_data_from_csv(str(csv_file))
+    assert df["close"].tolist() == [99.0]
+
+
+def test_parquet_cache_rebuilt_for_new_format_version(csv_file, monkeypatch):
+    pytest.importorskip("pyarrow")
+    load_data_from_csv(str(csv_file))
+    monkeypatch.setattr(indicators, "_CACHE_VERSION", indicators._CACHE_VERSION + 1)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("stale cache was read")
+
+    monkeypatch.setattr(indicators.pd, "read_parquet", fail)
+    import pyarrow.parquet as pq
+    monkeypatch.setattr(pq, "read_table", fail)
+    df = load_data_from_csv(str(csv_file))
+    assert len(df) == 4
+
+
+def test_load_without_cache(csv_file, monkeypatch):
+    monkeypatch.setattr(indicators, "_HAS_PYARROW", False)
+    load_data_from_csv(str(csv_file))
+    assert not csv_file.with_suffix(".parquet").exists()
+
+
+def test_indicators_on_unsorted_csv(tmp_path):
+    path = tmp_path / "unsorted.csv"
+    path.write_text(
+        "symbol,date,close\n"
+        "MSFT,2025-01-02,401.0\n"
+        "AAPL,2025-01-02,151.0\n"
+        "MSFT,2025-01-01,400.0\n"
+        "AAPL,2025-01-01,150.0\n"
+    )
+    df = load_data_from_csv(str(path), use_cache=False)
+    assert get_latest_close("AAPL", df) == pytest.approx(151.0)
+    assert get_latest_close("MSFT", df) == pytest.approx(401.0)
+
+
+def test_load_skips_unused_columns(tmp_path):
+    path = tmp_path / "wide.csv"
+    path.write_text(
+        "symbol,open,date,volume,close\n"
+        "AAPL,149.0,2025-01-01,1000,150.0\n"
+    )
+    df = load_data_from_csv(str(path), use_cache=False)
+    assert list(df.columns) == ["symbol", "date", "close"]
+    assert df["close"].tolist() == [150.0]
+
+
+def test_load_keeps_na_ticker(tmp_path):
+    path = tmp_path / "na.csv"
+    path.write_text(
+        "symbol,date,close\n"
+        "NA,2025-01-01,10.0\n"
+        "NA,2025-01-02,12.0\n"
+        "NULL,2025-01-01,\n"
+    )
+    df = load_data_from_csv(str(path), use_cache=False)
+    assert df["symbol"].tolist() == ["NA", "NA", "NULL"]
+    assert get_latest_close("NA", df) == pytest.approx(12.0)
+    assert calculate_average_price("NA", df, 20) == pytest.approx(11.0)
+    assert get_latest_close("NULL", df) == 0.0
+
+
+def test_load_mixed_precision_dates(tmp_path):
+    path = tmp_path / "mixed.csv"
+    path.write_text(
+        "symbol,date,close\n"
+        "AAPL,2025-01-01,1.0\n"
+        "AAPL,2025-01-03T10:00:00,3.0\n"
+        "AAPL,2025-01-02,2.0\n"
+    )
+    df = load_data_from_csv(str(path), use_cache=False)
+    assert df["date"].notna().all()
+    assert get_latest_close("AAPL", df) == pytest.approx(3.0)
+
+
+def test_load_mixed_utc_offsets(tmp_path):
+    path = tmp_path / "dst.csv"
+    path.write_text(
+        "symbol,date,close\n"
+        "AAPL,2025-03-07T16:00:00-05:00,1.0\n"
+        "AAPL,2025-03-10T16:00:00-04:00,2.0\n"
+        "AAPL,2025-03-10T23:00:00+05:00,9.0\n"
+    )
+    df = load_data_from_csv(str(path), use_cache=False)
+    assert df["date"].notna().all()
+    # 16:00-04:00 is 20:00 UTC, later than 23:00+05:00 (18:00 UTC)
+    assert get_latest_close("AAPL", df) == pytest.approx(2.0)
@@ -1,5 +1,15 @@
+import numpy as np
 import pytest
-from src.indicators import calculate_rsi
+from src.indicators import (
+    _rsi_numpy,
+    _rsi_wilder,
+    calculate_average_price,
+    calculate_bands_and_rsi,
+    calculate_bollinger_bands,
+    calculate_rsi,
+    clear_cache,
+    get_latest_close,
+)
 
 
 def test_rsi_uptrend():
@@ -110,3 +120,66 @@ def test_rsi_custom_period():
     # 4 changes: +1, +1, +1, +1
     # avg_gain = 1.0, avg_loss = 0.0
     assert rsi == pytest.approx(100.0)
+
+
+def test_rsi_wilder_smoothing():
+    """Test RSI seeds from the first `period` changes, then smooths the rest."""
+    data = [
+        {"symbol": "TEST", "close": 1.0},
+        {"symbol": "TEST", "close": 3.0},  # +2
+        {"symbol": "TEST", "close": 2.0},  # -1
+        {"symbol": "TEST", "close": 2.0},  # 0
+    ]
+    rsi = calculate_rsi("TEST", data, period=2)
+    # seed: avg_gain = 2/2 = 1.0, avg_loss = 1/2 = 0.5
+    # smooth: avg_gain = (1.0 + 0) / 2 = 0.5, avg_loss = (0.5 + 0) / 2 = 0.25
+    # RS = 2 => RSI = 100 - 100 / 3
+    assert rsi == pytest.approx(200.0 / 3.0)
+
+
+@pytest.mark.parametrize("period", [2, 4, 14])
+def test_rsi_numpy_matches_kernel(period):
+    """Test the NumPy fallback agrees with the Wilder kernel."""
+    prices = np.array([100.0, 101.0, 100.0, 102.0, 101.0, 103.0, 102.0, 104.0,
+                       103.0, 105.0, 101.0, 99.0, 98.0, 100.0, 97.0, 96.0, 99.0, 95.0])
+    assert _rsi_numpy(prices, period) == pytest.approx(_rsi_wilder(prices, period), abs=1e-9)
+
+
+def test_bands_and_rsi_matches_separate_calls():
+    """Test the fused pass agrees with the separate bands and RSI calculations."""
+    closes = [100.0, 101.0, 100.0, 102.0, 101.0, 103.0, 102.0, 104.0, 103.0, 105.0,
+              101.0, 99.0, 98.0, 100.0, 97.0, 96.0, 99.0, 95.0, 94.0, 96.0, 93.0, 92.0]
+    data = [{"symbol": "TEST", "close": close} for close in closes]
+    fused = calculate_bands_and_rsi("TEST", data, 20, 14)
+    bands = calculate_bollinger_bands("TEST", data, 20)
+    for key in ("average", "std_dev", "upper", "lower"):
+        assert fused[key] == pytest.approx(bands[key])
+    assert fused["rsi"] == pytest.approx(calculate_rsi("TEST", data, 14))
+
+
+def test_bands_and_rsi_no_data():
+    """Test the fused pass with no data for symbol returns all 0.0."""
+    assert calculate_bands_and_rsi("TEST", []) == {
+        "average": 0.0, "std_dev": 0.0, "upper": 0.0, "lower": 0.0, "rsi": 0.0,
+    }
+
+
+def test_rsi_row_order_independent():
+    """Test dated rows give the same indicators whatever order they arrive in."""
+    closes = [100.0, 101.0, 100.0, 102.0, 101.0, 103.0, 102.0, 104.0, 103.0, 105.0, 101.0,
+              99.0, 98.0, 100.0, 97.0, 96.0, 99.0, 95.0, 94.0, 96.0, 93.0, 92.0]
+    forward = [
+        {"symbol": "TEST", "date": f"2025-01-{day:02d}", "close": close}
+        for day, close in enumerate(closes, start=1)
+    ]
+    results = []
+    for data in (forward, list(reversed(forward))):
+        clear_cache()
+        results.append((
+            calculate_rsi("TEST", data, 14),
+            calculate_average_price("TEST", data, 20),
+            calculate_bollinger_bands("TEST", data, 20)["lower"],
+            get_latest_close("TEST", data),
+        ))
+    assert results[1] == pytest.approx(results[0])
+    assert results[0][3] == pytest.approx(92.0)
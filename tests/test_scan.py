@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+from src import indicators
+from src.indicators import get_latest_close, load_data_from_csv, scan_for_opportunities
+
+
+@pytest.fixture(params=[True, False], ids=["fused", "vectorized"])
+def scan_path(request, monkeypatch):
+    # Without numba the scan takes the vectorized pandas path; cover both
+    monkeypatch.setattr(indicators, "_HAS_NUMBA", request.param)
+    return request.param
+
+
+@pytest.fixture
+def data():
+    # DROP: flat at 100 then a sharp sell-off -> below lower band with low RSI
+    # FLAT: unchanged closes -> never an opportunity
+    rows = []
+    closes = [100.0] * 20 + [98.0, 96.0, 94.0, 92.0, 90.0, 80.0]
+    for day, close in enumerate(closes, start=1):
+        rows.append({"symbol": "DROP", "date": f"2025-01-{day:02d}", "close": close})
+        rows.append({"symbol": "FLAT", "date": f"2025-01-{day:02d}", "close": 50.0})
+    return rows
+
+
+def test_scan_finds_oversold(data, scan_path):
+    opportunities = scan_for_opportunities(data, 20, 14)
+    assert [o["symbol"] for o in opportunities] == ["DROP"]
+    opp = opportunities[0]
+    assert opp["latest_close"] == pytest.approx(80.0)
+    assert opp["latest_close"] < opp["lower_band"]
+    assert opp["rsi"] < 30
+
+
+def test_scan_no_data(scan_path):
+    assert scan_for_opportunities([], 20, 14) == []
+
+
+def test_scan_skips_invalid_closes(data, scan_path):
+    data.append({"symbol": "BAD", "date": "2025-01-01", "close": "n/a"})
+    opportunities = scan_for_opportunities(data, 20, 14)
+    assert [o["symbol"] for o in opportunities] == ["DROP"]
+
+
+def test_scan_sorted_by_symbol(data, scan_path):
+    zed = [dict(row, symbol="ZED") for row in data if row["symbol"] == "DROP"]
+    opportunities = scan_for_opportunities(zed + data, 20, 14)
+    assert [o["symbol"] for o in opportunities] == ["DROP", "ZED"]
+
+
+def test_scan_latest_close_first_row_of_max_date(data, scan_path):
+    # Same rule as get_latest_close: of two rows on the max date, the first one wins
+    data.append({"symbol": "DROP", "date": "2025-01-26", "close": 79.0})
+    opportunities = scan_for_opportunities(data, 20, 14)
+    assert [o["symbol"] for o in opportunities] == ["DROP"]
+    assert opportunities[0]["latest_close"] == pytest.approx(80.0)
+    assert get_latest_close("DROP", data) == pytest.approx(80.0)
+
+
+def test_scan_latest_close_ignores_undated_row(data, scan_path):
+    # The trailing undated 10.0 is not the latest close, so DROP (80.0) stays above the band
+    data.append({"symbol": "DROP", "date": None, "close": 10.0})
+    assert scan_for_opportunities(data, 20, 14) == []
+
+
+def test_scan_latest_close_without_dates(data, scan_path):
+    undated = [dict(row, date=None) for row in data]
+    opportunities = scan_for_opportunities(undated, 20, 14)
+    assert [o["symbol"] for o in opportunities] == ["DROP"]
+    assert opportunities[0]["latest_close"] == pytest.approx(80.0)
+
+
+def test_scan_paths_agree(monkeypatch):
+    data = load_data_from_csv(str(Path(__file__).resolve().parents[1] / "data" / "prices.csv"), use_cache=False)
+    results = {}
+    for has_numba in (True, False):
+        monkeypatch.setattr(indicators, "_HAS_NUMBA", has_numba)
+        results[has_numba] = scan_for_opportunities(data, 20, 14)
+    fused, vectorized = results[True], results[False]
+    assert fused
+    assert [o["symbol"] for o in fused] == [o["symbol"] for o in vectorized]
+    for a, b in zip(fused, vectorized):
+        for key in ("latest_close", "lower_band", "rsi"):
+            assert a[key] == pytest.approx(b[key], rel=1e-9)
+        assert a["latest_close"] == get_latest_close(a["symbol"], data)